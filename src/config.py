@@ -0,0 +1,60 @@
+import os
+import importlib
+
+# The root of the project (bearing the "data" folder) can be set with this variable;
+# it defaults to the current working directory, as in the notebooks.
+ROOT_ENV: str = "HOME_CREDIT_ROOT"
+
+CHUNK_SIZE: int = 1_000_000             # Number of rows read at a time
+
+
+
+def get_root_dir(root_dir: str = None)->str:
+    """
+    Description:
+        A method to get the root of the project.
+    Args:
+        * root_dir  : A String bearing an explicit root; None by default, in which
+                      case the HOME_CREDIT_ROOT variable (or the current working
+                      directory) is used.
+    Returns:
+        * root_dir  : A String bearing the root of the project.
+    """
+    if root_dir is None:
+        root_dir = os.environ.get(ROOT_ENV, os.getcwd())
+    return root_dir
+
+
+
+def get_data_path(*parts: str, root_dir: str = None)->str:
+    """
+    Description:
+        A method to get a path inside the "data" folder of the project,
+        e.g. get_data_path("original", "POS_CASH_balance.csv").
+    """
+    return os.path.join(get_root_dir(root_dir), "data", *parts)
+
+
+
+def lazy_submodules(package: str, submodules: list):
+    """
+    Description:
+        A method to get the module-level '__getattr__' and '__dir__' (PEP 562)
+        of a package, importing its submodules only when they are first accessed.
+        * Hence 'import src.eda' does not load seaborn/matplotlib until
+          'src.eda.visualization' is used.
+    Args:
+        * package   : A String bearing the name of the package (its '__name__').
+        * submodules: A List of the names of the submodules.
+    Returns:
+        * __getattr__, __dir__ : The methods to be set in the package.
+    """
+    def __getattr__(name: str):
+        if name in submodules:
+            return importlib.import_module("." + name, package)
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__()->list:
+        return sorted(set(vars(importlib.import_module(package))) | set(submodules))
+
+    return __getattr__, __dir__
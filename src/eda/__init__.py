@@ -0,0 +1,5 @@
+from ..config import lazy_submodules
+
+# The submodules are imported on first access (PEP 562):
+__all__: list = ["streaming", "tabular", "visualization"]
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
@@ -0,0 +1,360 @@
+import numpy as np
+import pandas as pd
+
+# Accuracy of the quantile sketch (KLL, Karnin-Lang-Liberty 2016):
+#   * With the default K_SKETCH = 200, any quantile/rank read from the sketch is
+#     within ~1.33% of the total count (normalized rank error) with 99% confidence;
+#     in general the error scales as ~2.3/k^0.97 (the Apache DataSketches bound).
+#   * Count, Mean, Minimum, Maximum, Skewness and Kurtosis are exact (up to
+#     floating point error), since they are maintained as merged central moments.
+#   * The Mode is tracked with a Misra-Gries summary of K_MODE counters, so any
+#     value occurring more than n/(K_MODE+1) times is guaranteed to be retained.
+K_SKETCH: int = 200
+K_MODE: int = 64
+C_SKETCH: float = 2/3                   # Capacity decay between adjacent compactors
+
+
+
+class StreamingStats:
+    """
+    Description:
+        A mergeable accumulator of the statistics reported by 'tabular.desc_num_var'
+        for a 'numeric' variable that is read in chunks (or by several workers).
+        * The central moments are combined with the pairwise update formulas of
+          Chan et al. / Pebay (Welford's method generalized to chunks).
+        * The quantiles are estimated with a KLL sketch, hence the Quartiles, IQR,
+          Whiskers and the Number of Outliers carry the rank error stated in
+          K_SKETCH (the outliers are off by at most ~2 x 1.33% of the count).
+        * Between updates, the memory usage is O(K_SKETCH + K_MODE), independent of
+          the number of rows; 'update' temporarily holds O(chunk) more (the level-0
+          buffer before its compaction and the distinct values of the chunk).
+    Args:
+        * k     : An Integer bearing the size of the largest compactor of the sketch.
+        * seed  : An Integer bearing the seed for the random compactions.
+    """
+
+    def __init__(self, k: int = K_SKETCH, seed: int = None)->None:
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+
+        # Moments of the non-null values:
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.m3: float = 0.0
+        self.m4: float = 0.0
+        self.minimum: float = np.nan
+        self.maximum: float = np.nan
+        self.missing: int = 0
+
+        # Sketches:
+        self.compactors: list = [np.array([], dtype="float64")]
+        self.mode_counts: dict = {}
+
+
+    def update(self, series: pd.Series)->"StreamingStats":
+        """
+        Description:
+            A method to add a chunk of values to the accumulator.
+        Args:
+            * series: A Pandas Series (or any 1-D iterable) containing the chunk.
+        Returns:
+            * self  : The updated accumulator (for chaining).
+        """
+        values = np.asarray(series, dtype="float64")
+        nulls = np.isnan(values)
+        self.missing += int(nulls.sum())
+        values = values[~nulls]
+        if len(values) == 0:
+            return self
+
+        # Central moments of the chunk:
+        mean = values.mean()
+        dev = values - mean
+        dev2 = dev*dev
+        other = {
+            "count": len(values), "mean": mean,
+            "m2": dev2.sum(), "m3": (dev2*dev).sum(), "m4": (dev2*dev2).sum(),
+            "minimum": values.min(), "maximum": values.max()
+        }
+        self._merge_moments(other)
+
+        # Sketches:
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+        # Only the top K_MODE+1 counts of the chunk can survive the merge:
+        uniques, counts = np.unique(values, return_counts=True)
+        if len(counts) > K_MODE + 1:
+            top = np.argpartition(counts, -(K_MODE + 1))[-(K_MODE + 1):]
+            uniques, counts = uniques[top], counts[top]
+        self._merge_modes(dict(zip(uniques.tolist(), counts.tolist())))
+
+        return self
+
+
+    def merge(self, other: "StreamingStats")->"StreamingStats":
+        """
+        Description:
+            A method to combine the accumulator of another chunk/worker into this one.
+        Args:
+            * other : A StreamingStats object to be merged (left unchanged).
+        Returns:
+            * self  : The merged accumulator (for chaining).
+        """
+        self.missing += other.missing
+        if other.count == 0:
+            return self
+        self._merge_moments(vars(other))
+
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.array([], dtype="float64"))
+        for h, items in enumerate(other.compactors):
+            self.compactors[h] = np.concatenate([self.compactors[h], items])
+        self._compress()
+
+        self._merge_modes(other.mode_counts)
+
+        return self
+
+
+    def quantile(self, q):
+        """
+        Description:
+            A method to estimate the quantile(s) of the values seen so far.
+        Args:
+            * q     : A Float (or an iterable of Floats) between 0 and 1.
+        Returns:
+            * value : A Float (or a Numpy Array) containing the estimated quantile(s).
+        """
+        items, weights = self.weighted_items()
+        if len(items) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+
+        order = np.argsort(items, kind="stable")
+        items, cum_weights = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(q, dtype="float64") * cum_weights[-1]
+        idx = np.searchsorted(cum_weights, ranks, side="left")
+        value = items[np.clip(idx, 0, len(items)-1)]
+
+        # The extremes are known exactly:
+        value = np.where(np.asarray(q) <= 0, self.minimum, value)
+        value = np.where(np.asarray(q) >= 1, self.maximum, value)
+        return value if np.ndim(q) else float(value)
+
+
+    def rank(self, value: float, inclusive: bool = True)->float:
+        """
+        Description:
+            A method to estimate the number of values less than (or equal to) a value.
+        Args:
+            * value     : A Float bearing the value to be ranked.
+            * inclusive : A Boolean denoting whether equal values are to be counted.
+        Returns:
+            * rank      : A Float bearing the estimated number of values.
+        """
+        items, weights = self.weighted_items()
+        mask = (items <= value) if inclusive else (items < value)
+        return float(weights[mask].sum())
+
+
+    def skew(self)->float:
+        """
+        Description:
+            A method to get the (bias-adjusted) skewness, as in 'pd.Series.skew'.
+        """
+        n = self.count
+        if n < 3 or self.m2 == 0:
+            return np.nan
+        return n * np.sqrt(n-1) / (n-2) * self.m3 / self.m2**1.5
+
+
+    def kurt(self)->float:
+        """
+        Description:
+            A method to get the (bias-adjusted) excess kurtosis, as in 'pd.Series.kurt'.
+        """
+        n = self.count
+        if n < 4 or self.m2 == 0:
+            return np.nan
+        adj = 3 * (n-1)**2 / ((n-2)*(n-3))
+        return n*(n+1)*(n-1) * self.m4 / ((n-2)*(n-3)*self.m2**2) - adj
+
+
+    def mode(self)->float:
+        """
+        Description:
+            A method to get the most frequent value retained by the Misra-Gries summary.
+        """
+        if not self.mode_counts:
+            return np.nan
+        top = max(self.mode_counts.values())
+        return min(v for v, c in self.mode_counts.items() if c == top)
+
+
+    def box_stats(self)->dict:
+        """
+        Description:
+            A method to get the Box Plot statistics of the values seen so far.
+        Returns:
+            * stats : A Dictionary with the keys expected by 'matplotlib.axes.Axes.bxp'
+                      along with the IQR and the number of outliers.
+        """
+        q1, q2, q3 = self.quantile([0.25, 0.50, 0.75])
+        iqr = abs(q3 - q1)
+
+        # Deriving the range of the Whiskers in the Box Plot
+        max_limit = min(self.maximum, q3 + 1.5*iqr)
+        min_limit = max(self.minimum, q1 - 1.5*iqr)
+
+        # Getting the number of Outlier Values using IQR method:
+        num_outliers = self.rank(min_limit, inclusive=False) \
+            + (self.count - self.rank(max_limit, inclusive=True))
+
+        return {
+            "whislo": min_limit, "q1": q1, "med": q2, "q3": q3, "whishi": max_limit,
+            "fliers": [], "iqr": iqr, "num_outliers": round(num_outliers)
+        }
+
+
+    def describe(self)->pd.Series:
+        """
+        Description:
+            A method to get the same report as 'tabular.desc_num_var'.
+        Returns:
+            * temp_df   : A Pandas Series containing the description of the column.
+        """
+        box = self.box_stats()
+        total = self.count + self.missing
+
+        temp_df = pd.Series({
+            "Minimum": self.minimum,
+            "Q1 (25%)": box["q1"],
+            "Q2 (50%)": box["med"],
+            "Q3 (75%)": box["q3"],
+            "Maximum": self.maximum,
+            "Mean": self.mean if self.count else np.nan,
+            "Median": box["med"],
+            "Mode": self.mode(),
+            "Skewness": self.skew(),
+            "Kurtosis": self.kurt(),
+            "IQR Magnitude": box["iqr"],
+            "Lower Limit of Whisker": box["whislo"],
+            "Upper Limit of Whisker": box["whishi"],
+            "Number of Outliers": box["num_outliers"],
+            "Percentage of Outliers": box["num_outliers"]/total*100 if total else np.nan
+        })
+        return temp_df
+
+
+    def _merge_moments(self, other: dict)->None:
+        """
+        Description:
+            A method to combine the moments with those of another set of values.
+        """
+        n_a, n_b = self.count, other["count"]
+        n = n_a + n_b
+        delta = other["mean"] - self.mean
+        delta_n = delta / n
+
+        m2 = self.m2 + other["m2"] + delta*delta_n*n_a*n_b
+        m3 = self.m3 + other["m3"] \
+            + delta*delta_n**2*n_a*n_b*(n_a - n_b) \
+            + 3*delta_n*(n_a*other["m2"] - n_b*self.m2)
+        m4 = self.m4 + other["m4"] \
+            + delta*delta_n**3*n_a*n_b*(n_a*n_a - n_a*n_b + n_b*n_b) \
+            + 6*delta_n**2*(n_a*n_a*other["m2"] + n_b*n_b*self.m2) \
+            + 4*delta_n*(n_a*other["m3"] - n_b*self.m3)
+
+        self.mean += delta_n*n_b
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.count = n
+        self.minimum = np.fmin(self.minimum, other["minimum"])
+        self.maximum = np.fmax(self.maximum, other["maximum"])
+
+
+    def _merge_modes(self, counts: dict)->None:
+        """
+        Description:
+            A method to combine the Misra-Gries summary with another one
+            (Agarwal et al., 'Mergeable Summaries', 2012).
+        """
+        merged = self.mode_counts.copy()
+        for value, count in counts.items():
+            merged[value] = merged.get(value, 0) + count
+
+        # Keeping the top K_MODE counters (a zero counter is still a candidate):
+        if len(merged) > K_MODE:
+            values = list(merged)
+            counts = np.fromiter(merged.values(), dtype="int64", count=len(values))
+            top = np.argpartition(counts, -(K_MODE + 1))
+            offset = counts[top[-(K_MODE + 1)]]
+            merged = {values[i]: int(counts[i] - offset) for i in top[-K_MODE:]}
+        self.mode_counts = merged
+
+
+    def _capacity(self, h: int)->int:
+        """
+        Description:
+            A method to get the capacity of the compactor at the height 'h'.
+        """
+        depth = len(self.compactors) - h - 1
+        return max(2, int(np.ceil(self.k * C_SKETCH**depth)))
+
+
+    def _compress(self)->None:
+        """
+        Description:
+            A method to compact the sketch until it fits into its capacity.
+        """
+        h = 0
+        while h < len(self.compactors):
+            items = self.compactors[h]
+            if len(items) >= self._capacity(h):
+                if h+1 == len(self.compactors):
+                    self.compactors.append(np.array([], dtype="float64"))
+
+                # Promote every other item (with a random offset) to the next height:
+                items = np.sort(items)
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                offset = int(self.rng.integers(2))
+                self.compactors[h+1] = np.concatenate(
+                    [self.compactors[h+1], paired[offset::2]]
+                )
+                self.compactors[h] = keep
+            h += 1
+
+
+    def weighted_items(self):
+        """
+        Description:
+            A method to get all the retained items along with their weights.
+        """
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(len(c), 2.0**h) for h, c in enumerate(self.compactors)
+        ])
+        return items, weights
+
+
+
+def stream_stats(chunks, column: str = None, k: int = K_SKETCH, seed: int = None)->StreamingStats:
+    """
+    Description:
+        A method to accumulate the statistics of a 'numeric' variable over chunks.
+    Args:
+        * chunks    : An iterable of Pandas Series/DataFrames, e.g. the object
+                      returned by 'pd.read_csv(..., chunksize=...)'.
+        * column    : A String bearing the name of the column if the chunks are
+                      DataFrames; None by default.
+        * k         : An Integer bearing the size of the quantile sketch.
+        * seed      : An Integer bearing the seed for the sketch.
+    Returns:
+        * stats     : A StreamingStats object containing the accumulated statistics.
+    """
+    stats = StreamingStats(k=k, seed=seed)
+    for chunk in chunks:
+        stats.update(chunk if column is None else chunk[column])
+
+    return stats
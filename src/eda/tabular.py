@@ -1,8 +1,10 @@
-import os
 import numpy as np
 import pandas as pd
 
-ROOT_DIR: str = os.path.join("C:\\Users","KIIT","Desktop","Home Credit Default Risk")
+from ..config import get_root_dir
+from .streaming import stream_stats
+
+ROOT_DIR: str = get_root_dir()         # Set HOME_CREDIT_ROOT to override (see 'src/config.py')
 
 
 
@@ -101,6 +103,31 @@ def desc_num_var(series: pd.Series):
 
 
 
+def desc_num_var_stream(chunks, column: str = None, seed: int = None):
+    """
+    Description:
+        A method to describe a 'numeric' variable without visualization,
+        reading it in chunks so that the column is never fully materialized.
+        * The quartiles, whiskers and outliers are estimated from a quantile sketch
+          (see 'streaming.K_SKETCH' for the error bounds); the rest is exact.
+    Args:
+        * chunks: An iterable of Pandas Series/DataFrames containing the variable,
+                  e.g. 'pd.read_csv(path, usecols=[column], chunksize=10**6)'.
+        * column: A String bearing the name of the column if the chunks are
+                  DataFrames; None by default.
+        * seed  : An Integer bearing the seed for the quantile sketch.
+    Returns:
+        * None
+    """
+    temp_df = stream_stats(chunks, column=column, seed=seed).describe()
+
+    print("\t\tDESCRIPTION OF THE COLUMN")
+    print(temp_df)
+
+    return None
+
+
+
 def desc_cat_var(series: pd.Series):
     """
     Description:
@@ -240,4 +240,50 @@ def plot_num_num_corr(
         )
     
     fig.show()
-    return None
\ No newline at end of file
+    return None
+
+
+def numeric_distribution_stream(
+    title: str,
+    stats,
+    bins: int = 50
+)->None:
+    """
+    Description:
+        A method to plot the distribution of a numeric variable from its
+        streaming statistics (see 'streaming.StreamingStats'), so that the
+        variable need not be loaded in memory.
+        * The Box Plot is drawn from the estimated quartiles and whiskers.
+        * The Histogram is drawn from the weighted items retained by the sketch.
+    Args:
+        * title     : A String bearing the title for the entire plot.
+        * stats     : A StreamingStats object accumulated over the variable.
+        * bins      : An Integer bearing the number of bins of the Histogram.
+    Returns:
+        * None.
+    """
+    fig = plt.figure(
+        figsize=(14,10),
+        frameon=True,
+        edgecolor="black",
+        linewidth=2
+    )
+    fig.suptitle(title)
+
+    # Adding the Box Plot:
+    fig.add_axes([0, 0.45, 1, 0.45]).bxp(
+        bxpstats = [stats.box_stats()],
+        vert = False,
+        showfliers = False
+    )
+
+    # Adding the Distribution Plot:
+    items, weights = stats.weighted_items()
+    fig.add_axes([0, 0, 1, 0.35]).hist(
+        x = items,
+        weights = weights,
+        bins = bins
+    )
+
+    fig.show()
+    return None
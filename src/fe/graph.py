@@ -0,0 +1,221 @@
+import pandas as pd
+
+
+
+class Feature:
+    """
+    Description:
+        A node of the feature graph: a (row-level) derived quantity computed from
+        source columns and/or other nodes, optionally aggregated per credit.
+        * Nodes without 'agg' are intermediates; they are computed only if some
+          requested output depends on them, and only once.
+        * Nodes with 'agg' are outputs; all of them are aggregated together over
+          a single grouping of the key.
+    Args:
+        * name      : A String bearing the name of the feature (the output column).
+        * func      : A method computing the feature from its inputs (passed as
+                      keyword arguments); None for the identity of a single input.
+        * inputs    : A Dictionary mapping the arguments of 'func' to the names of
+                      the source columns or the other nodes.
+        * agg       : A String bearing the aggregation over the key ("median",
+                      "sum", "first", ...); None for an intermediate.
+    """
+
+    def __init__(self, name: str, func, inputs: dict, agg: str = None)->None:
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.agg = agg
+
+
+    def compute(self, values: dict)->pd.Series:
+        """
+        Description:
+            A method to compute the (row-level) feature from its computed inputs.
+        """
+        kwargs = {arg: values[src] for arg, src in self.inputs.items()}
+        if self.func is None:
+            return next(iter(kwargs.values()))
+        return self.func(**kwargs)
+
+
+
+def get_tolerance_days(
+    days_with_tol: pd.Series,
+    days_without_tol: pd.Series
+)->pd.Series:
+    """
+    Description:
+        A method to compute the tolerance days for the credit
+        (shared by the POS_CASH and the credit card features).
+    Args:
+        * days_with_tol     : A Pandas Series containing the 
+          number of DPD for the credit under normal circumstances.
+        * days_without_tol  : A Pandas Series containing the
+          'reduced' number of DPD for the credit due to special
+          considerations by the credit authority.
+    Returns:
+        * tolerance_days    : A Pandas Series containing the 
+          number of days reduced as a result of special consideration.
+    """
+    tolerance_days: pd.Series = days_with_tol - days_without_tol
+    return tolerance_days
+
+
+
+def tolerance_features(name: str, agg: str = "median")->list:
+    """
+    Description:
+        A method to declare the tolerance days (SK_DPD_DEF - SK_DPD) as an
+        intermediate node, DAYS_TOLERANCE, and its aggregation as an output.
+    Args:
+        * name      : A String bearing the name of the output, e.g. "POS_DAYS_TOLERANCE".
+        * agg       : A String bearing the aggregation over the key.
+    Returns:
+        * features  : A List of Feature objects (the intermediate and the output).
+    """
+    features = [
+        Feature(
+            name = "DAYS_TOLERANCE",
+            func = get_tolerance_days,
+            inputs = {"days_with_tol": "SK_DPD_DEF", "days_without_tol": "SK_DPD"}
+        ),
+        Feature(name = name, func = None, inputs = {"days": "DAYS_TOLERANCE"}, agg = agg)
+    ]
+
+    return features
+
+
+
+def flag_features(prefix: str, column: str, values, agg: str = "sum")->list:
+    """
+    Description:
+        A method to declare the presence flags of the given values in a column,
+        labelled after the prefix and the value, e.g. "FLAG_POS_AMORTIZED_DEBT".
+    Args:
+        * prefix    : A String bearing the prefix of the labels, e.g. "FLAG_POS_".
+        * column    : A String bearing the name of the column to be inspected.
+        * values    : An iterable containing the values to be checked for presence.
+        * agg       : A String bearing the aggregation over the key.
+    Returns:
+        * features  : A List of Feature objects, one per value.
+    """
+    features = []
+    for value in values:
+        label = prefix + ("_".join(value.split()).upper())
+        features.append(Feature(
+            name = label,
+            func = lambda status, value=value: status == value,
+            inputs = {"status": column},
+            agg = agg
+        ))
+
+    return features
+
+
+
+def plan(features: list, outputs: list = None):
+    """
+    Description:
+        A method to get the nodes (in the order of evaluation) and the source
+        columns needed for the requested outputs.
+    Args:
+        * features  : A List of Feature objects declaring the graph.
+        * outputs   : A List of the names of the requested outputs;
+                      all the aggregated features by default.
+    Returns:
+        * order     : A List of the names of the nodes to be computed.
+        * sources   : A List of the names of the source columns to be read.
+    """
+    graph = {f.name: f for f in features}
+    if outputs is None:
+        outputs = [f.name for f in features if f.agg is not None]
+
+    order, sources, seen = [], [], set()
+
+    def visit(name: str)->None:
+        if name in seen:
+            return
+        seen.add(name)
+        if name not in graph:
+            sources.append(name)
+            return
+        for src in graph[name].inputs.values():
+            if src == name:
+                sources.append(src)         # A node passing a source column through
+            else:
+                visit(src)
+        order.append(name)
+
+    for name in outputs:
+        if graph.get(name) is None or graph[name].agg is None:
+            raise KeyError(f"'{name}' is not an aggregated feature of the graph")
+        visit(name)
+
+    return order, sources
+
+
+
+def required_columns(features: list, outputs: list = None, key: str = "SK_ID_PREV")->list:
+    """
+    Description:
+        A method to get the (narrow) set of source columns needed for the requested
+        outputs, e.g. for the 'columns' argument of 'validation.load_table'.
+    """
+    _, sources = plan(features, outputs)
+    return [key] + [col for col in sources if col != key]
+
+
+
+def evaluate(
+    df: pd.DataFrame,
+    features: list,
+    outputs: list = None,
+    key: str = "SK_ID_PREV",
+    fill_value = None
+)->pd.DataFrame:
+    """
+    Description:
+        A method to evaluate the requested outputs of a feature graph.
+        * Only the nodes (and the source columns) the outputs depend on are touched.
+        * Every node is computed once and released as soon as its last
+          dependent has been computed.
+        * All the outputs are aggregated over a single grouping of the key.
+    Args:
+        * df        : A Pandas DataFrame containing the source columns (left unchanged).
+        * features  : A List of Feature objects declaring the graph.
+        * outputs   : A List of the names of the requested outputs;
+                      all the aggregated features by default.
+        * key       : A String bearing the name of the column to aggregate over.
+        * fill_value: A value to impute the NaN values of the outputs with;
+                      None (no imputation) by default.
+    Returns:
+        * new_fs    : A Pandas DataFrame containing the outputs indexed by the key.
+    """
+    graph = {f.name: f for f in features}
+    if outputs is None:
+        outputs = [f.name for f in features if f.agg is not None]
+    order, sources = plan(features, outputs)
+
+    # Number of pending dependents of every node/source (outputs are kept):
+    refs: dict = {}
+    for name in order:
+        for src in graph[name].inputs.values():
+            refs[src] = refs.get(src, 0) + 1
+
+    values = {col: df[col] for col in sources}
+    for name in order:
+        values[name] = graph[name].compute(values)
+        for src in graph[name].inputs.values():
+            refs[src] -= 1
+            if refs[src] == 0 and src not in outputs:
+                del values[src]
+
+    # Feature Aggregation (over a single grouping):
+    rows = pd.DataFrame({name: values[name] for name in outputs}, index=df.index)
+    new_fs = rows.groupby(df[key]).agg({name: graph[name].agg for name in outputs})
+
+    if fill_value is not None:
+        new_fs = new_fs.fillna(fill_value)
+
+    return new_fs
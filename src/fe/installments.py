@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from .graph import Feature, evaluate
+
 
 
 def get_pay_ratio(
@@ -53,35 +55,44 @@ def get_features(df: pd.DataFrame)->pd.DataFrame:
     """
     Description:
         A method to get the new feature space from the installments dataframe.
+        * It evaluates all of FEATURES (see 'build_features').
     Args:
         * df    : A Pandas DataFrame containing the installments payments data.
     Returns:
         * new_fs: A Pandas DataFrame generated as a result of feature generation
                   and selection process.
     """
-    # Computing the payment ratio for each installment:
-    df["INST_PAY_RATIO"] = get_pay_ratio(
-        amt_payable = df["AMT_INSTALMENT"],
-        amt_paid = df["AMT_PAYMENT"]
-    )
+    new_fs = build_features(df)
+    return new_fs
+
 
-    # Computing the days delayed for every installment:
-    df["INST_DAYS_DELAYED"] = get_delay_days(
-        pay_day = df["DAYS_ENTRY_PAYMENT"],
-        due_day = df["DAYS_INSTALMENT"]
-    )
 
-    # Feature Selection:
-    new_fs = df[
-        ["SK_ID_PREV", "SK_ID_CURR", "INST_PAY_RATIO", "INST_DAYS_DELAYED"]
-    ]
+# The feature space declared as a lazy graph (see 'graph.evaluate'):
+FEATURES: list = [
+    Feature("SK_ID_CURR", None, {"value": "SK_ID_CURR"}, agg="first"),
+    Feature(
+        "INST_PAY_RATIO", get_pay_ratio,
+        {"amt_payable": "AMT_INSTALMENT", "amt_paid": "AMT_PAYMENT"}, agg="median"
+    ),
+    Feature(
+        "INST_DAYS_DELAYED", get_delay_days,
+        {"pay_day": "DAYS_ENTRY_PAYMENT", "due_day": "DAYS_INSTALMENT"}, agg="median"
+    )
+]
 
-    # Feature Aggregation:
-    new_fs = new_fs.groupby(
-        by = "SK_ID_PREV"       # Aggregation to obtain data specific to previous credit
-    ).median()                  # We choose median over mean due to the high skewness
 
-    # Type conversion:
-    new_fs["SK_ID_CURR"] = new_fs["SK_ID_CURR"].astype("int64")
 
+def build_features(df: pd.DataFrame, outputs: list = None)->pd.DataFrame:
+    """
+    Description:
+        A method to get (a subset of) the feature space lazily,
+        computing only what the requested features need.
+    Args:
+        * df        : A Pandas DataFrame containing the installments payments data
+                      (left unchanged).
+        * outputs   : A List of the names of the requested features; all by default.
+    Returns:
+        * new_fs    : A Pandas DataFrame containing the features per SK_ID_PREV.
+    """
+    new_fs = evaluate(df, FEATURES, outputs)
     return new_fs
@@ -0,0 +1,204 @@
+import time
+import queue
+import threading
+import pandas as pd
+
+from ..config import CHUNK_SIZE, get_data_path
+from ..fe import installments, pos_cash, credit_card
+from ..fe.graph import required_columns
+from .validation import SCHEMAS, load_table
+
+# The tables of the feature build (in the order of the notebooks) and their modules:
+TABLES: dict = {
+    "installments_payments": installments,
+    "POS_CASH_balance": pos_cash,
+    "credit_card_balance": credit_card
+}
+
+
+
+def prefetch(iterable, max_pending: int = 1):
+    """
+    Description:
+        A method to iterate over an iterable (e.g. tables or chunks being read)
+        in a background thread, while the caller processes the current item.
+        * The producer takes a slot before it starts decoding an item, and the slot
+          is freed when the caller takes the item; hence at most 'max_pending' items
+          (finished or in progress) exist ahead of the one held by the caller.
+        * The previous item is released when the caller asks for the next one,
+          so the caller should drop its own references to it as well.
+        * The exceptions of the producer are raised in the caller.
+    Args:
+        * iterable      : An iterable whose items are expensive to produce,
+                          e.g. a generator of 'validation.load_table' calls.
+        * max_pending   : An Integer bearing the number of items read ahead.
+    Yields:
+        * item          : The items of the iterable, in order.
+    """
+    items = queue.Queue()               # Bounded by the slots, not by its size
+    slots = threading.Semaphore(max_pending)
+    stop = threading.Event()
+
+    def acquire()->bool:
+        while not stop.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def produce()->None:
+        iterator = iter(iterable)
+        try:
+            while acquire():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    items.put(("done", None))
+                    return
+                items.put(("item", item))
+                item = None             # Not holding the item once it is handed over
+        except BaseException as error:
+            items.put(("error", error))
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            kind, item = items.get()
+            if kind == "error":
+                raise item
+            if kind == "done":
+                break
+            slots.release()             # Letting the producer start on the next item
+            yield item
+            item = None                 # Not holding the item the caller is done with
+    finally:
+        stop.set()                      # Releasing the producer if the caller stops early
+        worker.join()
+
+
+
+def get_path(table: str, root_dir: str = None)->str:
+    """
+    Description:
+        A method to get the path of an original table of the dataset.
+    Args:
+        * table     : A String bearing the name of the table, e.g. "POS_CASH_balance".
+        * root_dir  : A String bearing the root of the project (see
+                      'config.get_root_dir'); None by default.
+    Returns:
+        * path      : A String bearing the path of the CSV file.
+    """
+    return get_data_path("original", table + ".csv", root_dir=root_dir)
+
+
+
+def build_features(
+    root_dir: str = None,
+    tables: list = None,
+    max_pending: int = 1,
+    chunksize: int = CHUNK_SIZE,
+    prefetching: bool = True
+):
+    """
+    Description:
+        A method to build the feature spaces of the tables, reading (and validating)
+        the next table in the background while the current one is being processed.
+        * Within a table, the next chunk is parsed while the current one is cleaned.
+        * Besides the table being processed, at most 'max_pending' tables (finished
+          or being read) and 'max_pending' chunks are held in memory.
+    Args:
+        * root_dir      : A String bearing the root of the project.
+        * tables        : A List of the names of the tables; all of TABLES by default.
+        * max_pending   : An Integer bearing the number of tables read ahead.
+        * chunksize     : An Integer bearing the number of rows read at a time.
+        * prefetching   : A Boolean denoting whether to read in the background; if
+                          False, the same narrow tables are read one after the other.
+    Returns:
+        * features      : A Dictionary mapping the tables to their feature spaces.
+        * reports       : A Dictionary mapping the tables to their violation reports.
+    """
+    tables = list(TABLES) if tables is None else tables
+
+    def read():
+        for table in tables:
+            module = TABLES[table]
+            columns = required_columns(module.FEATURES, getattr(module, "OUTPUTS", None))
+            yield table, load_table(
+                path = get_path(table, root_dir),
+                schema = SCHEMAS[table],
+                columns = [col for col in SCHEMAS[table] if col in columns],
+                chunksize = chunksize,
+                reader = prefetch if prefetching else None
+            )
+
+    tables_read = prefetch(read(), max_pending=max_pending) if prefetching else read()
+
+    features, reports = {}, {}
+    for table, (df, report) in tables_read:
+        features[table] = TABLES[table].build_features(df)
+        reports[table] = report
+        del df                          # Releasing the table before asking for the next one
+
+    return features, reports
+
+
+
+def build_features_sequential(root_dir: str = None, tables: list = None)->dict:
+    """
+    Description:
+        A method to build the feature spaces of the tables as in the notebooks,
+        i.e. reading and processing one full table after the other.
+    Args:
+        * root_dir  : A String bearing the root of the project.
+        * tables    : A List of the names of the tables; all of TABLES by default.
+    Returns:
+        * features  : A Dictionary mapping the tables to their feature spaces.
+    """
+    tables = list(TABLES) if tables is None else tables
+
+    features = {}
+    for table in tables:
+        df = pd.read_csv(get_path(table, root_dir))
+        if table == "POS_CASH_balance":
+            df = df[df["NAME_CONTRACT_STATUS"] != "XNA"].reset_index(drop=True)
+        elif table == "credit_card_balance":
+            df = df.fillna(0)
+        features[table] = TABLES[table].get_features(df)
+
+    return features
+
+
+
+def benchmark(root_dir: str = None, tables: list = None, repeat: int = 1)->pd.DataFrame:
+    """
+    Description:
+        A method to measure the end-to-end time of the prefetching feature build
+        against the sequential flow of the notebooks.
+        * The "Narrow, no prefetching" flow reads the same (pruned, validated) columns
+          as the prefetching one, one table after the other; comparing the two gives
+          the gain of the overlap alone, the rest being the column pruning.
+    Args:
+        * root_dir  : A String bearing the root of the project.
+        * tables    : A List of the names of the tables; all of TABLES by default.
+        * repeat    : An Integer bearing the number of runs of each flow.
+    Returns:
+        * table     : A Pandas DataFrame containing the best time (in seconds)
+                      of each flow and the speed-up.
+    """
+    flows = {
+        "Sequential (notebooks)": lambda: build_features_sequential(root_dir, tables),
+        "Narrow, no prefetching": lambda: build_features(root_dir, tables, prefetching=False),
+        "Prefetching": lambda: build_features(root_dir, tables)
+    }
+
+    table = pd.DataFrame(columns=["Flow", "Time (s)"])
+    for name, flow in flows.items():
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            flow()
+            times.append(time.perf_counter() - start)
+        table.loc[len(table)] = [name, min(times)]
+
+    table["Speed-up"] = table["Time (s)"].iloc[0] / table["Time (s)"]
+    return table
@@ -0,0 +1,187 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+
+from ..config import CHUNK_SIZE
+
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+
+def hash_uniform(keys, seed: int = 0)->np.ndarray:
+    """
+    Description:
+        A method to map integer keys to pseudo-random numbers in [0, 1).
+        * The same key always gets the same number for a given seed, hence a
+          key (and all the rows bearing it) is either sampled or not, in every
+          chunk and in every table.
+    Args:
+        * keys  : An iterable containing the integer keys (e.g. SK_ID_CURR).
+        * seed  : An Integer bearing the seed of the hash.
+    Returns:
+        * u     : A Numpy Array containing the numbers in [0, 1).
+    """
+    # SplitMix64 finalizer over (key + seed * gamma):
+    with np.errstate(over="ignore"):
+        z = np.asarray(keys).astype("uint64") + np.uint64(seed) * GOLDEN_GAMMA
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+
+    u = (z >> np.uint64(11)).astype("float64") * 2.0**-53
+    return u
+
+
+
+def _check_strata(strata: pd.Series, fractions: dict)->None:
+    """
+    Description:
+        A method to check that the strata and their fractions are given together
+        (either one alone would silently fall back to a uniform sample).
+    """
+    if (strata is not None) != bool(fractions):
+        raise ValueError("'strata' and 'fractions' must be given together")
+
+
+
+def select_groups(
+    chunk: pd.DataFrame,
+    key: str,
+    fraction: float,
+    seed: int = 0,
+    strata: pd.Series = None,
+    fractions: dict = None
+)->pd.Series:
+    """
+    Description:
+        A method to get the rows of a chunk belonging to the sampled groups.
+    Args:
+        * chunk     : A Pandas DataFrame containing a chunk of the table.
+        * key       : A String bearing the name of the grouping column,
+                      i.e. "SK_ID_CURR" or "SK_ID_PREV".
+        * fraction  : A Float bearing the fraction of groups to be sampled.
+        * seed      : An Integer bearing the seed of the sample.
+        * strata    : A Pandas Series mapping every group (index) to its stratum
+                      (value), e.g. the TARGET indexed by SK_ID_CURR; None by default.
+        * fractions : A Dictionary mapping a stratum to its own sampling fraction;
+                      the strata not mentioned are sampled at 'fraction'.
+                      It is required along with 'strata' (ValueError otherwise).
+    Returns:
+        * mask      : A Pandas Series of Booleans denoting the sampled rows.
+    """
+    _check_strata(strata, fractions)
+    rate = pd.Series(fraction, index=chunk.index, dtype="float64")
+    if strata is not None:
+        rate = chunk[key].map(strata).map(fractions).fillna(fraction)
+
+    mask = pd.Series(hash_uniform(chunk[key], seed), index=chunk.index) < rate
+    return mask
+
+
+
+def get_group_strata(
+    chunks,
+    key: str,
+    column: str,
+    order_by: str = "MONTHS_BALANCE"
+)->pd.Series:
+    """
+    Description:
+        A method to get a single stratum per group for a column that varies
+        within the group (e.g. NAME_CONTRACT_STATUS), taking the value at the
+        latest 'order_by' (or the last one read if the column is absent).
+    Args:
+        * chunks    : An iterable of Pandas DataFrames, preferably read with
+                      'usecols=[key, column, order_by]' to keep the pass cheap.
+        * key       : A String bearing the name of the grouping column.
+        * column    : A String bearing the name of the stratification column.
+        * order_by  : A String bearing the name of the column ordering the rows.
+    Returns:
+        * strata    : A Pandas Series mapping every group to its stratum
+                      (empty if there are no chunks).
+    """
+    latest = None
+    for chunk in chunks:
+        if order_by in chunk.columns:
+            chunk = chunk.sort_values(by=order_by, kind="stable")
+        chunk = chunk.drop_duplicates(subset=key, keep="last")
+        latest = chunk if latest is None else pd.concat([latest, chunk])
+        if order_by in latest.columns:
+            latest = latest.sort_values(by=order_by, kind="stable")
+        latest = latest.drop_duplicates(subset=key, keep="last")
+
+    if latest is None:
+        return pd.Series(dtype="object", name=column, index=pd.Index([], name=key))
+
+    strata = latest.set_index(key)[column]
+    return strata
+
+
+
+def sample_table(
+    path: str,
+    key: str = "SK_ID_CURR",
+    fraction: float = 0.01,
+    seed: int = 0,
+    strata: pd.Series = None,
+    fractions: dict = None,
+    cache_dir: str = None,
+    chunksize: int = CHUNK_SIZE,
+    **read_kwargs
+)->pd.DataFrame:
+    """
+    Description:
+        A method to draw a reproducible sample of whole groups from a table
+        in a single streaming pass, caching the result on the disk.
+        * Sampling every table by SK_ID_CURR with the same seed keeps the same
+          clients everywhere, so the samples can still be joined.
+        * The result is cached under 'cache_dir' (by default, the "sampled"
+          folder next to the folder of the table), keyed by the arguments
+          and the modification time of the table.
+    Args:
+        * path      : A String bearing the path of the CSV file.
+        * key       : A String bearing the name of the grouping column.
+        * fraction  : A Float bearing the fraction of groups to be sampled.
+        * seed      : An Integer bearing the seed of the sample.
+        * strata    : A Pandas Series mapping every group to its stratum;
+                      None by default (see 'select_groups').
+        * fractions : A Dictionary mapping a stratum to its sampling fraction
+                      (required along with 'strata').
+        * cache_dir : A String bearing the folder for the cached samples;
+                      caching is disabled if set to False.
+        * chunksize : An Integer bearing the number of rows read at a time.
+        * read_kwargs: Additional arguments for 'pd.read_csv' (e.g. usecols).
+    Returns:
+        * sample    : A Pandas DataFrame containing the sampled rows.
+    """
+    _check_strata(strata, fractions)
+
+    cache_path = None
+    if cache_dir is not False:
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(path))), "sampled")
+        digest = hashlib.sha1(repr((
+            os.path.abspath(path), os.path.getmtime(path), key, fraction, seed,
+            None if strata is None else pd.util.hash_pandas_object(strata).sum(),
+            sorted(fractions.items()) if fractions else None,
+            sorted(read_kwargs.items())
+        )).encode()).hexdigest()[:12]
+        name = os.path.splitext(os.path.basename(path))[0]
+        cache_path = os.path.join(cache_dir, f"{name}_{digest}.pkl")
+
+        if os.path.exists(cache_path):
+            return pd.read_pickle(cache_path)
+
+    # Single pass over the table:
+    parts = [
+        chunk[select_groups(chunk, key, fraction, seed, strata, fractions)]
+        for chunk in pd.read_csv(path, chunksize=chunksize, **read_kwargs)
+    ]
+    sample = pd.concat(parts, ignore_index=True)
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        sample.to_pickle(cache_path)
+
+    return sample
@@ -0,0 +1,297 @@
+import numpy as np
+import pandas as pd
+
+from ..config import CHUNK_SIZE
+
+# A schema maps every column of a table to its rules:
+#   * dtype       : the type of the column ("int64", "float64" or "category").
+#   * categories  : the allowed categories; any other value is a violation (set to NaN).
+#   * drop_values : the values for which the entire row is dropped (e.g. "XNA").
+#   * min / max   : the allowed range; values outside it (and +/-inf) are violations
+#                   handled as per 'on_range' ("null" by default, "clip" or "drop").
+#   * nulls       : the null policy; "keep" (default), "drop" the row or a fill value
+#                   (only the nulls dropped or filled are reported as violations).
+INSTALLMENTS_SCHEMA: dict = {
+    "SK_ID_PREV": {"dtype": "int64", "nulls": "drop"},
+    "SK_ID_CURR": {"dtype": "int64", "nulls": "drop"},
+    "NUM_INSTALMENT_VERSION": {"dtype": "float64", "min": 0},
+    "NUM_INSTALMENT_NUMBER": {"dtype": "int64", "min": 1},
+    "DAYS_INSTALMENT": {"dtype": "float64", "max": 0},
+    "DAYS_ENTRY_PAYMENT": {"dtype": "float64", "max": 0},
+    "AMT_INSTALMENT": {"dtype": "float64", "min": 0},
+    "AMT_PAYMENT": {"dtype": "float64", "min": 0}
+}
+
+POS_CASH_SCHEMA: dict = {
+    "SK_ID_PREV": {"dtype": "int64", "nulls": "drop"},
+    "SK_ID_CURR": {"dtype": "int64", "nulls": "drop"},
+    "MONTHS_BALANCE": {"dtype": "int64", "max": 0},
+    "CNT_INSTALMENT": {"dtype": "float64", "min": 0},
+    "CNT_INSTALMENT_FUTURE": {"dtype": "float64", "min": 0},
+    "NAME_CONTRACT_STATUS": {
+        "dtype": "category",
+        "categories": [
+            "Active", "Completed", "Signed", "Demand", "Returned to the store",
+            "Approved", "Amortized debt", "Canceled"
+        ],
+        "drop_values": ["XNA"]
+    },
+    "SK_DPD": {"dtype": "int64", "min": 0},
+    "SK_DPD_DEF": {"dtype": "int64", "min": 0}
+}
+
+CREDIT_CARD_SCHEMA: dict = {
+    "SK_ID_PREV": {"dtype": "int64", "nulls": "drop"},
+    "SK_ID_CURR": {"dtype": "int64", "nulls": "drop"},
+    "MONTHS_BALANCE": {"dtype": "int64", "max": 0},
+    **{
+        col: {"dtype": "float64", "nulls": 0}
+        for col in [
+            "AMT_BALANCE", "AMT_CREDIT_LIMIT_ACTUAL", "AMT_DRAWINGS_ATM_CURRENT",
+            "AMT_DRAWINGS_CURRENT", "AMT_DRAWINGS_OTHER_CURRENT",
+            "AMT_DRAWINGS_POS_CURRENT", "AMT_INST_MIN_REGULARITY",
+            "AMT_PAYMENT_CURRENT", "AMT_PAYMENT_TOTAL_CURRENT",
+            "AMT_RECEIVABLE_PRINCIPAL", "AMT_RECIVABLE", "AMT_TOTAL_RECEIVABLE",
+            "CNT_DRAWINGS_ATM_CURRENT", "CNT_DRAWINGS_CURRENT",
+            "CNT_DRAWINGS_OTHER_CURRENT", "CNT_DRAWINGS_POS_CURRENT",
+            "CNT_INSTALMENT_MATURE_CUM"
+        ]
+    },
+    "NAME_CONTRACT_STATUS": {
+        "dtype": "category",
+        "categories": [
+            "Active", "Completed", "Signed", "Demand",
+            "Sent proposal", "Refused", "Approved"
+        ]
+    },
+    "SK_DPD": {"dtype": "int64", "min": 0},
+    "SK_DPD_DEF": {"dtype": "int64", "min": 0}
+}
+
+SCHEMAS: dict = {
+    "installments_payments": INSTALLMENTS_SCHEMA,
+    "POS_CASH_balance": POS_CASH_SCHEMA,
+    "credit_card_balance": CREDIT_CARD_SCHEMA
+}
+
+# The (narrow) set of columns required by the 'get_features' methods in 'src/fe':
+FEATURE_COLUMNS: dict = {
+    "installments_payments": [
+        "SK_ID_PREV", "SK_ID_CURR", "DAYS_INSTALMENT", "DAYS_ENTRY_PAYMENT",
+        "AMT_INSTALMENT", "AMT_PAYMENT"
+    ],
+    "POS_CASH_balance": [
+        "SK_ID_PREV", "SK_ID_CURR", "NAME_CONTRACT_STATUS", "SK_DPD", "SK_DPD_DEF"
+    ],
+    "credit_card_balance": [
+        "SK_ID_PREV", "SK_ID_CURR", "AMT_BALANCE", "AMT_CREDIT_LIMIT_ACTUAL",
+        "AMT_DRAWINGS_CURRENT", "AMT_INST_MIN_REGULARITY",
+        "AMT_PAYMENT_TOTAL_CURRENT", "AMT_RECIVABLE", "AMT_TOTAL_RECEIVABLE",
+        "CNT_DRAWINGS_CURRENT", "NAME_CONTRACT_STATUS", "SK_DPD", "SK_DPD_DEF"
+    ]
+}
+
+
+
+def clean_chunk(
+    chunk: pd.DataFrame,
+    schema: dict,
+    counts: dict
+)->pd.DataFrame:
+    """
+    Description:
+        A method to apply the rules of a schema to a chunk of a table.
+        * All the rules are evaluated column-wise (vectorized) and the rows to be
+          dropped are removed at once, after all the rules have been checked.
+    Args:
+        * chunk     : A Pandas DataFrame containing a freshly read chunk.
+        * schema    : A Dictionary mapping the columns to their rules.
+        * counts    : A Dictionary mapping (column, rule) to the number of violations
+                      (and "rows" to the number of rows read), updated in place.
+    Returns:
+        * chunk     : A Pandas DataFrame containing the clean chunk.
+    """
+    drop = np.zeros(len(chunk), dtype=bool)
+    cleaned: dict = {}
+    counts["rows"] = counts.get("rows", 0) + len(chunk)
+
+    def count(col: str, rule: str, mask)->None:
+        counts[(col, rule)] = counts.get((col, rule), 0) + int(mask.sum())
+
+    for col in chunk.columns:
+        rules = schema.get(col, {})
+        values = chunk[col]
+        missing = values.isna().to_numpy()
+
+        # Rows to be dropped for specific values and allowed categories
+        # (both read from the codes of a single categorical conversion):
+        if "categories" in rules:
+            allowed, dropped = rules["categories"], rules.get("drop_values", [])
+            codes = values.astype(pd.CategoricalDtype(allowed + dropped)).cat.codes.to_numpy()
+
+            mask = codes >= len(allowed)
+            count(col, "drop_values", mask)
+            drop |= mask
+
+            mask = (codes == -1) & ~missing
+            count(col, "categories", mask)
+            values = pd.Series(
+                pd.Categorical.from_codes(np.where(mask | drop, -1, codes), categories=allowed),
+                index=values.index, name=col
+            )
+        elif "drop_values" in rules:
+            mask = values.isin(rules["drop_values"]).to_numpy()
+            count(col, "drop_values", mask)
+            drop |= mask
+
+        # Allowed range:
+        if "min" in rules or "max" in rules:
+            lower, upper = rules.get("min", -np.inf), rules.get("max", np.inf)
+            array = values.to_numpy()
+            mask = (array < lower) | (array > upper)
+            if array.dtype.kind == "f":
+                mask |= np.isinf(array)
+            count(col, "range", mask)
+            if mask.any():
+                action = rules.get("on_range", "null")
+                if action == "drop":
+                    drop |= mask
+                elif action == "clip":
+                    values = values.clip(lower=lower, upper=upper)
+                else:
+                    values = values.astype("float64").mask(mask)
+
+        # Null policy (the nulls that are kept are not violations):
+        policy = rules.get("nulls", "keep")
+        if policy != "keep":
+            count(col, "nulls", missing & ~drop)
+        nulls = values.isna().to_numpy()
+        if nulls.any() and policy == "drop":
+            drop |= nulls
+        elif nulls.any() and policy != "keep":
+            values = values.fillna(policy)
+
+        cleaned[col] = values
+
+    chunk = pd.DataFrame(cleaned, index=chunk.index)
+    if drop.any():
+        chunk = chunk[~drop]
+
+    # Final types (integers can only be restored once the nulls are handled):
+    cast = {}
+    for col in chunk.columns:
+        dtype = schema.get(col, {}).get("dtype")
+        if dtype in ("int64", "float64") and chunk[col].dtype != dtype \
+                and not (dtype == "int64" and chunk[col].isna().any()):
+            cast[col] = dtype
+
+    return chunk.astype(cast) if cast else chunk
+
+
+
+def iter_table(
+    path: str,
+    schema: dict,
+    columns: list = None,
+    chunksize: int = CHUNK_SIZE,
+    counts: dict = None,
+    row_filter = None,
+    reader = None
+):
+    """
+    Description:
+        A method to read a table chunk by chunk, cleaning every chunk as it is read.
+    Args:
+        * path      : A String bearing the path of the CSV file.
+        * schema    : A Dictionary mapping the columns to their rules.
+        * columns   : A List of the columns to be read (all by default);
+                      the other columns are never parsed.
+        * chunksize : An Integer bearing the number of rows read at a time.
+        * counts    : A Dictionary for accumulating the violations; None by default.
+        * row_filter: A method returning a Boolean mask for a raw chunk, applied
+                      before cleaning (e.g. 'sampling.select_groups'); None by default.
+        * reader    : A method wrapping the iterator of the raw chunks, e.g.
+                      'loader.prefetch' to parse the next chunk while the current
+                      one is being cleaned; None by default.
+    Yields:
+        * chunk     : A Pandas DataFrame containing a clean chunk.
+    """
+    counts = {} if counts is None else counts
+    columns = list(schema) if columns is None else columns
+
+    # Integers are left to the (fast) inference of the parser, which falls back
+    # to floats if there are nulls; they are restored once the nulls are handled:
+    dtype = {
+        col: "float64" for col in columns
+        if col in schema and schema[col]["dtype"] == "float64"
+    }
+
+    chunks = pd.read_csv(path, usecols=columns, dtype=dtype, chunksize=chunksize)
+    if reader is not None:
+        chunks = reader(chunks)
+
+    for chunk in chunks:
+        if row_filter is not None:
+            chunk = chunk[row_filter(chunk)]
+        yield clean_chunk(chunk, schema, counts)
+
+
+
+def get_report(counts: dict, total: int = None)->pd.DataFrame:
+    """
+    Description:
+        A method to tabulate the violations found while cleaning a table.
+    Args:
+        * counts    : A Dictionary mapping (column, rule) to the number of violations.
+        * total     : An Integer bearing the number of rows read; None by default.
+    Returns:
+        * report    : A Pandas DataFrame containing the violations (as absolute
+                      numbers and corresponding percentage) of the rules.
+    """
+    report = pd.DataFrame(
+        [
+            [key[0], key[1], num] for key, num in counts.items()
+            if isinstance(key, tuple) and num > 0
+        ],
+        columns=["Column", "Rule", "Violations"]
+    )
+    if total:
+        report["Violations by %"] = (report["Violations"]/total*100).round(5)
+
+    return report
+
+
+
+def load_table(
+    path: str,
+    schema: dict,
+    columns: list = None,
+    chunksize: int = CHUNK_SIZE,
+    row_filter = None,
+    reader = None
+):
+    """
+    Description:
+        A method to load a clean (and optionally narrow) table, validating it
+        chunk-wise while it is being read.
+    Args:
+        * path      : A String bearing the path of the CSV file.
+        * schema    : A Dictionary mapping the columns to their rules,
+                      e.g. SCHEMAS["POS_CASH_balance"].
+        * columns   : A List of the columns to be read (all by default),
+                      e.g. FEATURE_COLUMNS["POS_CASH_balance"].
+        * chunksize : An Integer bearing the number of rows read at a time.
+        * row_filter: A method returning a Boolean mask for a raw chunk; None by default.
+        * reader    : A method wrapping the iterator of the raw chunks; None by default.
+    Returns:
+        * df        : A Pandas DataFrame containing the clean table.
+        * report    : A Pandas DataFrame containing the violations found.
+    """
+    counts: dict = {}
+    df = pd.concat(
+        iter_table(path, schema, columns, chunksize, counts, row_filter, reader),
+        ignore_index=True
+    )
+
+    report = get_report(counts, total=counts.get("rows"))
+    return df, report
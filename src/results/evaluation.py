@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import hashlib
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+from ..config import get_data_path
+
+# Layout of the cache folder:
+#   * <column>.npy  : one file per feature column (the matrix is stored column-wise,
+#                     so adding/changing a feature rewrites only its own column).
+#   * manifest.json : the content hash of every column and the fold signature.
+#   * folds.npz     : the precomputed (stratified) fold indices.
+#   * joblib/       : the cached per-fold preprocessing and fold results.
+TARGET: str = "TARGET"
+KEY: str = "SK_ID_CURR"
+
+
+
+def _read_manifest(cache_dir: str)->dict:
+    """
+    Description:
+        A method to read the manifest of the stored matrix (empty if absent).
+    """
+    path = os.path.join(cache_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {"columns": {}, "folds": None}
+    with open(path) as file:
+        return json.load(file)
+
+
+
+def _write_manifest(cache_dir: str, manifest: dict)->None:
+    """
+    Description:
+        A method to write the manifest of the stored matrix.
+    """
+    with open(os.path.join(cache_dir, "manifest.json"), "w") as file:
+        json.dump(manifest, file, indent=1)
+
+
+
+def load_target(root_dir: str = None)->pd.Series:
+    """
+    Description:
+        A method to get the TARGET of the clients in application_train.csv.
+    Args:
+        * root_dir  : A String bearing the root of the project.
+    Returns:
+        * target    : A Pandas Series containing the TARGET indexed by SK_ID_CURR.
+    """
+    target = pd.read_csv(
+        get_data_path("original", "application_train.csv", root_dir=root_dir),
+        usecols=[KEY, TARGET]
+    ).set_index(KEY)[TARGET]
+    return target
+
+
+
+def build_matrix(
+    features: dict,
+    target: pd.Series,
+    cache_dir: str,
+    agg: str = "mean"
+)->list:
+    """
+    Description:
+        A method to join the feature spaces of the tables (per SK_ID_PREV) onto the
+        clients (per SK_ID_CURR) and to store the matrix column-wise on the disk.
+        * A column is rewritten only if its content (values and order) has changed.
+        * The columns no longer in the matrix are removed, with their files.
+    Args:
+        * features  : A Dictionary mapping the tables to their feature spaces,
+                      e.g. the first output of 'loader.build_features'.
+        * target    : A Pandas Series containing the TARGET indexed by SK_ID_CURR.
+        * cache_dir : A String bearing the folder of the stored matrix.
+        * agg       : A String bearing the aggregation of the credits of a client.
+    Returns:
+        * columns   : A List of the names of the stored feature columns.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+
+    # Feature Aggregation (per client) and Joining:
+    matrix = pd.DataFrame(index=target.index)
+    for fs in features.values():
+        fs = fs.groupby(by=KEY).agg(agg)
+        matrix = matrix.join(fs.replace([np.inf, -np.inf], np.nan), how="left")
+
+    columns = {TARGET: target.to_numpy(dtype="float64")}
+    columns.update({col: matrix[col].to_numpy(dtype="float64") for col in matrix.columns})
+
+    # Removing the stale columns:
+    for col in set(manifest["columns"]) - set(columns):
+        del manifest["columns"][col]
+        if os.path.exists(os.path.join(cache_dir, col + ".npy")):
+            os.remove(os.path.join(cache_dir, col + ".npy"))
+
+    for col, values in columns.items():
+        digest = hashlib.sha1(np.ascontiguousarray(values).tobytes()).hexdigest()
+        if manifest["columns"].get(col) != digest \
+                or not os.path.exists(os.path.join(cache_dir, col + ".npy")):
+            np.save(os.path.join(cache_dir, col + ".npy"), values)
+            manifest["columns"][col] = digest
+
+    _write_manifest(cache_dir, manifest)
+    return list(matrix.columns)
+
+
+
+def get_folds(cache_dir: str, n_splits: int = 5, seed: int = 0)->list:
+    """
+    Description:
+        A method to get the stratified fold indices, computed once and stored.
+    Args:
+        * cache_dir : A String bearing the folder of the stored matrix.
+        * n_splits  : An Integer bearing the number of folds.
+        * seed      : An Integer bearing the seed of the shuffle.
+    Returns:
+        * folds     : A List of (train, test) index arrays.
+    """
+    manifest = _read_manifest(cache_dir)
+    signature = f"{n_splits}-{seed}-{manifest['columns'][TARGET]}"
+    path = os.path.join(cache_dir, "folds.npz")
+
+    if manifest.get("folds") != signature or not os.path.exists(path):
+        y = np.load(os.path.join(cache_dir, TARGET + ".npy"))
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+        arrays = {}
+        for i, (train, test) in enumerate(splitter.split(np.zeros(len(y)), y)):
+            arrays[f"train_{i}"], arrays[f"test_{i}"] = train, test
+        np.savez(path, **arrays)
+        manifest["folds"] = signature
+        _write_manifest(cache_dir, manifest)
+
+    stored = np.load(path)
+    folds = [(stored[f"train_{i}"], stored[f"test_{i}"]) for i in range(n_splits)]
+    return folds
+
+
+
+def _fit_column(cache_dir: str, column: str, digest: str, folds: str, fold: int)->tuple:
+    """
+    Description:
+        A method to fit the preprocessing (median imputation and standardization)
+        of a column on the training part of a fold.
+        * It is cached by (column, digest, folds, fold), hence the unchanged
+          columns are never refitted.
+    """
+    values = np.load(os.path.join(cache_dir, column + ".npy"), mmap_mode="r")
+    train = np.load(os.path.join(cache_dir, "folds.npz"))[f"train_{fold}"]
+    values = values[train]
+
+    median = np.nanmedian(values) if not np.isnan(values).all() else 0.0
+    values = np.where(np.isnan(values), median, values)
+    mean, std = values.mean(), values.std()
+    return median, mean, (std if std > 0 else 1.0)
+
+
+
+def _run_fold(
+    cache_dir: str,
+    model,
+    columns: list,
+    digests: list,
+    folds: str,
+    fold: int
+)->dict:
+    """
+    Description:
+        A method to fit a model on the training part of a fold and to score it.
+        * It is cached by (model, columns, digests, folds, fold), hence a run
+          whose model and features have not changed is not recomputed.
+    """
+    fit_column = Memory(os.path.join(cache_dir, "joblib"), verbose=0).cache(_fit_column)
+    split = np.load(os.path.join(cache_dir, "folds.npz"))
+    train, test = split[f"train_{fold}"], split[f"test_{fold}"]
+    y = np.load(os.path.join(cache_dir, TARGET + ".npy"), mmap_mode="r")
+
+    # Preprocessing (column by column, from the memory-mapped matrix):
+    start = time.perf_counter()
+    X = np.empty((len(y), len(columns)), dtype="float64")
+    for j, (col, digest) in enumerate(zip(columns, digests)):
+        median, mean, std = fit_column(cache_dir, col, digest, folds, fold)
+        values = np.load(os.path.join(cache_dir, col + ".npy"), mmap_mode="r")
+        X[:, j] = (np.where(np.isnan(values), median, values) - mean) / std
+    prep_time = time.perf_counter() - start
+
+    # Model Fitting and Scoring:
+    start = time.perf_counter()
+    model = clone(model).fit(X[train], y[train])
+    fit_time = time.perf_counter() - start
+    auc = roc_auc_score(y[test], model.predict_proba(X[test])[:, 1])
+
+    return {
+        "Fold": fold, "AUC": auc,
+        "Preprocessing Time (s)": prep_time, "Fit Time (s)": fit_time
+    }
+
+
+
+def evaluate(
+    models: dict,
+    cache_dir: str,
+    columns: list = None,
+    n_splits: int = 5,
+    seed: int = 0,
+    n_jobs: int = -1
+):
+    """
+    Description:
+        A method to cross-validate the candidate models on the stored feature matrix,
+        running the folds and the models in parallel.
+    Args:
+        * models    : A Dictionary mapping names to (unfitted) scikit-learn classifiers.
+        * cache_dir : A String bearing the folder of the stored matrix
+                      (see 'build_matrix').
+        * columns   : A List of the names of the feature columns; all by default.
+        * n_splits  : An Integer bearing the number of folds.
+        * seed      : An Integer bearing the seed of the folds.
+        * n_jobs    : An Integer bearing the number of parallel jobs (joblib).
+    Returns:
+        * runs      : A Pandas DataFrame containing the AUC and the times per fold
+                      (and whether the fold was read from the cache).
+        * summary   : A Pandas DataFrame containing the mean/std AUC per model
+                      and the wall time of the evaluation.
+    """
+    start = time.perf_counter()
+    get_folds(cache_dir, n_splits, seed)
+    manifest = _read_manifest(cache_dir)
+    if columns is None:
+        columns = [col for col in manifest["columns"] if col != TARGET]
+    digests = [manifest["columns"][col] for col in columns]
+
+    run_fold = Memory(os.path.join(cache_dir, "joblib"), verbose=0).cache(_run_fold)
+    jobs = [(name, fold) for name in models for fold in range(n_splits)]
+    cached = [
+        run_fold.check_call_in_cache(
+            cache_dir, models[name], columns, digests, manifest["folds"], fold
+        )
+        for name, fold in jobs
+    ]
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(run_fold)(cache_dir, models[name], columns, digests, manifest["folds"], fold)
+        for name, fold in jobs
+    )
+
+    runs = pd.DataFrame(results)
+    runs.insert(0, "Model", [name for name, _ in jobs])
+    runs["Cached"] = cached             # The times of a cached run are those of its first run
+
+    summary = runs.groupby(by="Model", sort=False).agg(
+        AUC=("AUC", "mean"), AUC_STD=("AUC", "std")
+    ).rename(columns={"AUC": "Mean AUC", "AUC_STD": "Std AUC"})
+    summary["Wall Time (s)"] = time.perf_counter() - start
+
+    return runs, summary
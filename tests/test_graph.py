@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.fe import credit_card, installments, pos_cash
+from src.fe.graph import plan, required_columns
+
+N_ROWS: int = 400
+N_CREDITS: int = 30
+
+
+
+@pytest.fixture(scope="module")
+def rng()->np.random.Generator:
+    return np.random.default_rng(0)
+
+
+
+def get_keys(rng: np.random.Generator)->dict:
+    """
+    Description:
+        A method to get the keys of a synthetic table (a client per credit).
+    """
+    prev = rng.integers(1, N_CREDITS + 1, size=N_ROWS)
+    return {"SK_ID_PREV": prev, "SK_ID_CURR": 100_000 + prev % 7}
+
+
+
+def test_installments(rng: np.random.Generator)->None:
+    df = pd.DataFrame({
+        **get_keys(rng),
+        "DAYS_INSTALMENT": -rng.integers(0, 3000, size=N_ROWS).astype("float64"),
+        "DAYS_ENTRY_PAYMENT": -rng.integers(0, 3000, size=N_ROWS).astype("float64"),
+        "AMT_INSTALMENT": rng.uniform(0, 1e5, size=N_ROWS).round(2),
+        "AMT_PAYMENT": rng.uniform(0, 1e5, size=N_ROWS).round(2)
+    })
+    df.loc[::13, "DAYS_ENTRY_PAYMENT"] = np.nan
+
+    expected = pd.DataFrame({
+        "SK_ID_PREV": df["SK_ID_PREV"],
+        "SK_ID_CURR": df["SK_ID_CURR"],
+        "INST_PAY_RATIO": df["AMT_PAYMENT"]/df["AMT_INSTALMENT"],
+        "INST_DAYS_DELAYED": df["DAYS_ENTRY_PAYMENT"] - df["DAYS_INSTALMENT"]
+    }).groupby(by="SK_ID_PREV").median()
+
+    pd.testing.assert_frame_equal(installments.build_features(df), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(installments.get_features(df), expected, check_dtype=False)
+
+
+
+def test_pos_cash(rng: np.random.Generator)->None:
+    statuses = ["Active", "Completed", "Signed", "Approved", "Canceled",
+                "Amortized debt", "Returned to the store"]
+    df = pd.DataFrame({
+        **get_keys(rng),
+        "NAME_CONTRACT_STATUS": rng.choice(statuses, size=N_ROWS),
+        "SK_DPD": rng.integers(0, 30, size=N_ROWS),
+        "SK_DPD_DEF": rng.integers(0, 60, size=N_ROWS)
+    })
+
+    expected = pd.DataFrame({
+        "SK_ID_PREV": df["SK_ID_PREV"],
+        "SK_ID_CURR": df["SK_ID_CURR"],
+        "POS_DAYS_TOLERANCE": df["SK_DPD_DEF"] - df["SK_DPD"]
+    }).groupby(by="SK_ID_PREV").median()
+    for value in ["Canceled", "Approved", "Completed", "Amortized debt", "Returned to the store"]:
+        label = "FLAG_POS_" + "_".join(value.split()).upper()
+        expected[label] = (df["NAME_CONTRACT_STATUS"] == value).groupby(df["SK_ID_PREV"]).sum()
+
+    pd.testing.assert_frame_equal(pos_cash.build_features(df), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(pos_cash.get_features(df), expected, check_dtype=False)
+
+
+
+def test_credit_card(rng: np.random.Generator)->None:
+    statuses = ["Active", "Completed", "Signed", "Refused", "Approved"]
+    amounts = {
+        col: rng.choice([0.0, 0.0, *rng.uniform(0, 1e5, size=8).round(2)], size=N_ROWS)
+        for col in [
+            "AMT_BALANCE", "AMT_CREDIT_LIMIT_ACTUAL", "AMT_DRAWINGS_CURRENT",
+            "AMT_INST_MIN_REGULARITY", "AMT_PAYMENT_TOTAL_CURRENT",
+            "AMT_RECIVABLE", "AMT_TOTAL_RECEIVABLE"
+        ]
+    }
+    df = pd.DataFrame({
+        **get_keys(rng),
+        **amounts,
+        "CNT_DRAWINGS_CURRENT": rng.integers(0, 5, size=N_ROWS).astype("float64"),
+        "NAME_CONTRACT_STATUS": rng.choice(statuses, size=N_ROWS),
+        "SK_DPD": rng.integers(0, 100, size=N_ROWS),
+        "SK_DPD_DEF": rng.integers(0, 200, size=N_ROWS)
+    })
+
+    unpaid = (df["AMT_INST_MIN_REGULARITY"] - df["AMT_PAYMENT_TOTAL_CURRENT"]).clip(lower=0)
+    receivable = df["AMT_RECIVABLE"]
+    expected = pd.DataFrame({
+        "SK_ID_PREV": df["SK_ID_PREV"],
+        "SK_ID_CURR": df["SK_ID_CURR"],
+        "CC_CREDIT_UTIL_RATIO": df["AMT_BALANCE"]/df["AMT_CREDIT_LIMIT_ACTUAL"],
+        "CC_DAYS_TOLERANCE": df["SK_DPD_DEF"] - df["SK_DPD"],
+        "CC_UNPAID_RATIO": unpaid/df["AMT_INST_MIN_REGULARITY"],
+        "CC_SURCHARGE_RATIO": (df["AMT_TOTAL_RECEIVABLE"] - receivable)/receivable
+    }).groupby(by="SK_ID_PREV").median()
+    expected["CC_CNT_DEFAULTS"] = (df["SK_DPD_DEF"] > 90).groupby(df["SK_ID_PREV"]).sum()
+    for value in ["Completed", "Signed", "Refused", "Approved"]:
+        label = "FLAG_CC_" + value.upper()
+        expected[label] = (df["NAME_CONTRACT_STATUS"] == value).groupby(df["SK_ID_PREV"]).sum()
+    expected = expected.fillna(0)
+
+    pd.testing.assert_frame_equal(credit_card.build_features(df), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(credit_card.get_features(df), expected, check_dtype=False)
+
+
+
+def test_subset_reads_only_its_sources()->None:
+    order, sources = plan(credit_card.FEATURES, ["CC_DAYS_TOLERANCE"])
+    assert order == ["DAYS_TOLERANCE", "CC_DAYS_TOLERANCE"]
+    assert sorted(sources) == ["SK_DPD", "SK_DPD_DEF"]
+    assert required_columns(credit_card.FEATURES, ["CC_DAYS_TOLERANCE"]) == \
+        ["SK_ID_PREV", "SK_DPD_DEF", "SK_DPD"]
+
+
+
+def test_subset_evaluates_only_its_sources()->None:
+    # The other source columns are absent, so touching them would raise a KeyError:
+    df = pd.DataFrame({"SK_ID_PREV": [1, 1, 2], "SK_DPD": [0, 2, 5], "SK_DPD_DEF": [4, 2, 5]})
+    new_fs = credit_card.build_features(df, ["CC_DAYS_TOLERANCE"])
+    assert list(new_fs.columns) == ["CC_DAYS_TOLERANCE"]
+    assert new_fs["CC_DAYS_TOLERANCE"].tolist() == [2.0, 0.0]
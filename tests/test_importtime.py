@@ -0,0 +1,77 @@
+import os
+import sys
+import warnings
+import subprocess
+import pytest
+
+# The modules a worker may import and the heavy modules they must not pull in:
+TARGETS: dict = {
+    "src.fe.installments": ["seaborn", "matplotlib", "sklearn"],
+    "src.fe.pos_cash": ["seaborn", "matplotlib", "sklearn"],
+    "src.fe.credit_card": ["seaborn", "matplotlib", "sklearn"],
+    "src.pipeline.loader": ["seaborn", "matplotlib", "sklearn"],
+    "src.eda.tabular": ["seaborn", "matplotlib", "sklearn"],
+    "src.eda": ["seaborn", "matplotlib", "numpy", "pandas"]
+}
+# Budget for the import time of 'src' itself; it is only reported (as a warning when
+# exceeded), unless IMPORTTIME_BUDGET_MS is set, in which case it is enforced:
+BUDGET_ENV: str = "IMPORTTIME_BUDGET_MS"
+SRC_BUDGET_MS: float = float(os.environ.get(BUDGET_ENV, 50.0))
+PROJECT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+
+def measure(module: str)->dict:
+    """
+    Description:
+        A method to measure the import time of a module in a fresh interpreter
+        with 'python -X importtime'.
+        * The total includes numpy/pandas, which 'src/fe' needs anyway; the
+          budget applies to the time spent in 'src' itself.
+    Args:
+        * module    : A String bearing the name of the module, e.g. "src.fe.pos_cash".
+    Returns:
+        * result    : A Dictionary containing the time spent in 'src' itself
+                      and the set of the imported modules.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stderr
+
+    src_us, imported = 0, set()
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        imported.add(name)
+        if name == "src" or name.startswith("src."):
+            src_us += int(self_us)
+
+    return {"src_ms": src_us/1000, "imported": imported}
+
+
+
+@pytest.fixture(scope="module", params=list(TARGETS))
+def measured(request)->tuple:
+    # A single fresh interpreter per module, shared by the tests below:
+    return request.param, measure(request.param)
+
+
+
+def test_no_forbidden_imports(measured: tuple)->None:
+    module, result = measured
+    assert not [name for name in TARGETS[module] if name in result["imported"]]
+
+
+
+def test_src_import_time(measured: tuple, record_property)->None:
+    module, result = measured
+    record_property("src_ms", result["src_ms"])
+    if result["src_ms"] <= SRC_BUDGET_MS:
+        return
+    message = f"{module}: {result['src_ms']:.1f} ms in 'src' (budget {SRC_BUDGET_MS:.0f} ms)"
+    if os.environ.get(BUDGET_ENV):
+        pytest.fail(message)
+    warnings.warn(message)
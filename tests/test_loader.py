@@ -0,0 +1,60 @@
+import time
+import itertools
+import threading
+import pytest
+
+from src.pipeline.loader import prefetch
+
+TIMEOUT_S: float = 5.0
+
+
+
+def counting(n: int, produced: list):
+    """
+    Description:
+        A method to yield 0..n-1, counting in 'produced' the items started so far.
+    """
+    for i in range(n):
+        produced[0] += 1
+        yield i
+
+
+
+def test_order()->None:
+    assert list(prefetch(range(100), max_pending=3)) == list(range(100))
+
+
+
+def test_producer_error_is_raised()->None:
+    def failing():
+        yield 0
+        yield 1
+        raise ValueError("broken chunk")
+
+    received = []
+    with pytest.raises(ValueError, match="broken chunk"):
+        for item in prefetch(failing()):
+            received.append(item)
+    assert received == [0, 1]
+
+
+
+@pytest.mark.parametrize("max_pending", [1, 2, 4])
+def test_read_ahead_is_bounded(max_pending: int)->None:
+    produced = [0]
+    for consumed, item in enumerate(prefetch(counting(20, produced), max_pending), start=1):
+        time.sleep(0.02)                # Giving the producer the time to run ahead
+        assert consumed <= produced[0] <= consumed + max_pending
+
+
+
+def test_early_break_returns()->None:
+    def consume():
+        for item in prefetch(itertools.count(), max_pending=2):
+            if item == 3:
+                break
+
+    worker = threading.Thread(target=consume, daemon=True)
+    worker.start()
+    worker.join(timeout=TIMEOUT_S)
+    assert not worker.is_alive()
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.eda.streaming import StreamingStats, stream_stats
+
+RANK_ERROR: float = 0.0133             # The normalized rank error of K_SKETCH = 200
+N_ROWS: int = 200_000
+
+
+
+@pytest.fixture(scope="module")
+def series()->pd.Series:
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=3.0, sigma=1.0, size=N_ROWS).round(1)
+    values[rng.choice(N_ROWS, size=N_ROWS//100, replace=False)] = np.nan
+    return pd.Series(values)
+
+
+
+def merged_stats(series: pd.Series, n_workers: int = 4, chunksize: int = 7_000)->StreamingStats:
+    """
+    Description:
+        A method to accumulate a series as several workers would, i.e. chunk by
+        chunk on every worker and then merging the workers.
+    """
+    bounds = np.linspace(0, len(series), n_workers + 1).astype(int)
+    parts = [series.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    workers = [
+        stream_stats((part.iloc[i:i+chunksize] for i in range(0, len(part), chunksize)), seed=i)
+        for i, part in enumerate(parts)
+    ]
+    stats = workers[0]
+    for other in workers[1:]:
+        stats.merge(other)
+    return stats
+
+
+
+def test_moments_match_pandas(series: pd.Series)->None:
+    stats = merged_stats(series)
+    assert stats.count == series.count()
+    assert stats.missing == series.isna().sum()
+    assert stats.minimum == series.min() and stats.maximum == series.max()
+    assert np.isclose(stats.mean, series.mean(), rtol=1e-12, atol=0)
+    assert np.isclose(stats.skew(), series.skew(), rtol=1e-9, atol=0)
+    assert np.isclose(stats.kurt(), series.kurt(), rtol=1e-9, atol=0)
+
+
+
+@pytest.mark.parametrize("q", [0.25, 0.50, 0.75])
+def test_quartiles_within_rank_error(series: pd.Series, q: float)->None:
+    stats = merged_stats(series)
+    values = np.sort(series.dropna().to_numpy())
+    estimate = stats.quantile(q)
+
+    # Any value tied with the estimate may stand for it:
+    lower = np.searchsorted(values, estimate, side="left")/len(values)
+    upper = np.searchsorted(values, estimate, side="right")/len(values)
+    assert lower - RANK_ERROR <= q <= upper + RANK_ERROR
+
+
+
+def test_mode_heavy_hitter()->None:
+    # A value above n/(K_MODE+1) among distinct values is retained across chunks:
+    rng = np.random.default_rng(1)
+    values = rng.permutation(np.concatenate([np.arange(50_000.0), np.full(2_000, -1.0)]))
+    stats = stream_stats(np.array_split(values, 13))
+    assert stats.mode() == -1.0